@@ -1,32 +1,172 @@
+import asyncio
+import gzip
+import json
+import tempfile
 import requests
 import os
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Dict, Any, List
 from .utils import Logger, FileManager, ValidationHelper
 from .progress import TaskProgress
+from .circuit import CircuitBreaker, CircuitOpenError
+
+if TYPE_CHECKING:
+    import aiohttp
+
+class RewindableMultipartEncoder(MultipartEncoder):
+    """
+    MultipartEncoder que pode ser rebobinado para o início.
+    
+    O urllib3 registra a posição do corpo com tell() antes do envio e chama
+    seek() ao repetir uma requisição; sem isso, uma nova tentativa enviaria
+    um corpo já consumido. Assim como o MultipartEncoderMonitor, aceita um
+    callback chamado a cada bloco lido, com acesso a bytes_read e len.
+    """
+    
+    def __init__(self, fields, boundary=None, encoding='utf-8', callback=None):
+        super().__init__(fields, boundary=boundary, encoding=encoding)
+        self.callback = callback
+        self.bytes_read = 0
+    
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        if self.callback:
+            self.callback(self)
+        return chunk
+    
+    def tell(self):
+        return self.bytes_read
+    
+    def seek(self, offset, whence=0):
+        if offset != 0 or whence != 0:
+            raise OSError("RewindableMultipartEncoder só pode voltar ao início")
+        
+        for value in self.fields.values():
+            if isinstance(value, tuple) and hasattr(value[1], 'seek'):
+                value[1].seek(0)
+        
+        self.__init__(self.fields, boundary=self.boundary_value, encoding=self.encoding, callback=self.callback)
+        return 0
+
+class _ProgressFile:
+    """
+    Envolve um arquivo já pronto para envio (como o corpo comprimido) e
+    reporta os bytes lidos ao callback, com a mesma interface do encoder
+    (bytes_read e len). tell() e seek() são repassados ao arquivo para que
+    as novas tentativas do adapter continuem funcionando.
+    """
+    
+    def __init__(self, file: BinaryIO, callback: Optional[Callable] = None):
+        self._file = file
+        self.callback = callback
+        self.len = os.fstat(file.fileno()).st_size
+        self.bytes_read = file.tell()
+    
+    def read(self, size=-1):
+        chunk = self._file.read(size)
+        self.bytes_read += len(chunk)
+        if self.callback:
+            self.callback(self)
+        return chunk
+    
+    def tell(self):
+        return self._file.tell()
+    
+    def seek(self, offset, whence=0):
+        position = self._file.seek(offset, whence)
+        self.bytes_read = position
+        return position
+    
+    def close(self):
+        self._file.close()
+
+def _upload_succeeded(client, status_code, response_data, file_path):
+    """Monta o resultado de um upload aceito pela API."""
+    client.logger.info("Upload realizado com sucesso: %s", file_path)
+    return {
+        "success": True,
+        "status_code": status_code,
+        "message": "Upload realizado com sucesso",
+        "data": response_data,
+        "file_path": file_path
+    }
+
+def _upload_failed(client, error_msg):
+    """Registra e lança o erro de um upload recusado pela API."""
+    client.logger.error(error_msg)
+    raise Exception(error_msg)
+
+def _auth_error(client, status_code, response_data, file_path):
+    _upload_failed(client, "Erro de autenticação. Verifique o token de autorização.")
+
+def _payload_too_large(client, status_code, response_data, file_path):
+    _upload_failed(client, "Arquivo muito grande para upload.")
+
+def _validation_error(client, status_code, response_data, file_path):
+    _upload_failed(client, f"Erro de validação: {response_data.get('message', 'Dados inválidos')}")
+
+def _server_error(client, status_code, response_data, file_path):
+    _upload_failed(client, f"Erro interno do servidor: {response_data.get('message', 'Erro desconhecido')}")
+
+def _unexpected_error(client, status_code, response_data, file_path):
+    _upload_failed(client, f"Erro no upload (HTTP {status_code}): {response_data.get('message', 'Erro desconhecido')}")
 
 class CombustivelAPIClient:
     """Cliente para integração com a API de Combustível."""
     
-    def __init__(self, base_url: str, auth_token: str):
+    # Compartilhado entre instâncias para que o estado de cada URL base sobreviva ao cliente
+    _circuit_breaker = CircuitBreaker(failure_threshold=5, cooldown_s=30, half_open_max=2)
+    
+    # A API de Combustível retorna 201 (Created) para uploads bem-sucedidos;
+    # 200 também é aceito para compatibilidade. Demais 5xx caem em _server_error.
+    _STATUS_HANDLERS = {
+        201: _upload_succeeded,
+        200: _upload_succeeded,
+        401: _auth_error,
+        413: _payload_too_large,
+        422: _validation_error
+    }
+    
+    def __init__(self, base_url: str, auth_token: str, gzip_upload: bool = False):
         """
         Inicializa o cliente da API.
         
         Args:
             base_url (str): URL base da API
             auth_token (str): Token de autenticação
+            gzip_upload (bool): Comprime o corpo do upload com gzip, se a API anunciar suporte
         """
         self.base_url = base_url.rstrip('/')
         self.auth_token = auth_token
+        self.gzip_upload = gzip_upload
+        self._gzip_supported: Optional[bool] = None
         self.logger = Logger("CombustivelAPIClient")
         self.session = requests.Session()
         self._setup_session()
     
     def _setup_session(self):
-        """Configura a sessão HTTP com headers padrão."""
+        """Configura a sessão HTTP com headers padrão e pool de conexões."""
         self.session.headers.update({
             "Authorization": f"Bearer {self.auth_token}",
             "Accept": "application/json"
         })
+        
+        # Falhas transitórias são repetidas pelo próprio adapter, com backoff exponencial
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            backoff_jitter=0.25,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(["POST", "GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def upload_excel_file(self, file_path: str, timeout: int = 300) -> Dict[str, Any]:
         """
@@ -44,35 +184,35 @@ class CombustivelAPIClient:
         """
         with TaskProgress("Enviando arquivo para API", 100) as progress:
             try:
-                progress.update(10, "Validando arquivo")
-                self._validate_file(file_path)
-                
-                progress.update(20, "Preparando upload")
-                file_size = FileManager.get_file_size(file_path)
-                self.logger.info(f"Iniciando upload do arquivo: {file_path} ({file_size:,} bytes)")
+                file_size = self._validate_file(file_path)
+                self.logger.info("Iniciando upload do arquivo: %s (%s bytes)", file_path, f"{file_size:,}")
                 
-                progress.update(30, "Abrindo arquivo")
-                with open(file_path, 'rb') as file:
-                    files = {'file': (os.path.basename(file_path), file, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')}
-                    
-                    progress.update(30, "Enviando dados")
-                    response = self._make_upload_request(files, timeout)
+                # O progresso acompanha os bytes efetivamente enviados
+                response = self._make_upload_request_with_circuit(
+                    file_path, timeout,
+                    progress_callback=lambda encoder: progress.update_to(encoder.bytes_read, encoder.len)
+                )
                 
-                progress.update(10, "Processando resposta")
                 return self._handle_response(response, file_path)
                 
             except Exception as e:
-                self.logger.error(f"Erro no upload do arquivo: {str(e)}")
+                self.logger.error("Erro no upload do arquivo: %s", e)
                 raise Exception(f"Erro no upload do arquivo: {str(e)}")
     
-    def _validate_file(self, file_path: str):
-        """Valida se o arquivo existe e tem a extensão correta."""
-        if not FileManager.file_exists(file_path):
+    def _validate_file(self, file_path: str) -> int:
+        """
+        Valida se o arquivo existe e tem a extensão correta.
+        
+        Returns:
+            int: Tamanho do arquivo em bytes, obtido com uma única chamada a os.stat
+        """
+        file_stat = FileManager.stat(file_path)
+        if file_stat is None:
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        file_size = file_stat.st_size
         
         ValidationHelper.validate_file_extension(file_path, ['.xlsx', '.xls'])
         
-        file_size = FileManager.get_file_size(file_path)
         if file_size == 0:
             raise ValueError(f"Arquivo está vazio: {file_path}")
         
@@ -80,25 +220,116 @@ class CombustivelAPIClient:
         max_size = 50 * 1024 * 1024  # 50MB
         if file_size > max_size:
             raise ValueError(f"Arquivo muito grande ({file_size:,} bytes). Máximo permitido: {max_size:,} bytes")
+        
+        return file_size
     
-    def _make_upload_request(self, files: Dict, timeout: int) -> requests.Response:
-        """Realiza a requisição HTTP de upload."""
-        url = f"{self.base_url}/importacao-excel/upload"
+    def _make_upload_request_with_circuit(self, file_path: str, timeout: int, progress_callback: Optional[Callable] = None) -> requests.Response:
+        """Realiza o upload protegido pelo circuit breaker da URL base."""
+        breaker = self._circuit_breaker
+        previous_state = breaker.get_state(self.base_url)
         
         try:
-            response = self.session.post(
-                url=url,
-                files=files,
-                timeout=timeout
-            )
-            return response
+            state = breaker.before_call(self.base_url)
+        except CircuitOpenError as e:
+            self.logger.warning(str(e))
+            raise
+        self._log_circuit_transition(previous_state, state)
+        
+        try:
+            response = self._make_upload_request(file_path, timeout, progress_callback)
+        except Exception:
+            self._log_circuit_transition(state, breaker.record_failure(self.base_url))
+            raise
+        
+        if response.status_code >= 500:
+            new_state = breaker.record_failure(self.base_url)
+        else:
+            new_state = breaker.record_success(self.base_url)
+        self._log_circuit_transition(state, new_state)
+        
+        return response
+    
+    def _log_circuit_transition(self, previous_state: str, new_state: str):
+        """Registra no log as mudanças de estado do circuito."""
+        if previous_state != new_state:
+            self.logger.warning("Circuito da API %s: %s -> %s", self.base_url, previous_state, new_state)
+    
+    def _make_upload_request(self, file_path: str, timeout: int, progress_callback: Optional[Callable] = None) -> requests.Response:
+        """
+        Realiza a requisição HTTP de upload.
+        
+        O corpo multipart é gerado sob demanda pelo MultipartEncoder, que lê o
+        arquivo em blocos durante o envio em vez de montá-lo inteiro em memória.
+        O arquivo é aberto aqui e o encoder volta ao início a cada nova tentativa
+        ou redirecionamento, garantindo que o conteúdo completo seja reenviado.
+        """
+        url = f"{self.base_url}/importacao-excel/upload"
+        
+        with open(file_path, 'rb') as file:
+            compress = self.gzip_upload and self._server_accepts_gzip()
+            # Com gzip o encoder é consumido na compressão local; nesse caso o
+            # progresso acompanha a leitura do corpo comprimido durante o envio
+            encoder = RewindableMultipartEncoder(fields={
+                'file': (os.path.basename(file_path), file, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            }, callback=None if compress else progress_callback)
+            
+            body = encoder
+            headers = {"Content-Type": encoder.content_type}
+            if compress:
+                body = _ProgressFile(self._compress_body(encoder), callback=progress_callback)
+                headers["Content-Encoding"] = "gzip"
             
-        except requests.exceptions.Timeout:
-            raise Exception(f"Timeout na requisição após {timeout} segundos")
-        except requests.exceptions.ConnectionError:
-            raise Exception(f"Erro de conexão com a API: {self.base_url}")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Erro na requisição HTTP: {str(e)}")
+            try:
+                response = self.session.post(
+                    url=url,
+                    data=body,
+                    headers=headers,
+                    timeout=timeout
+                )
+                return response
+                
+            except requests.exceptions.Timeout:
+                raise Exception(f"Timeout na requisição após {timeout} segundos")
+            except requests.exceptions.ConnectionError:
+                raise Exception(f"Erro de conexão com a API: {self.base_url}")
+            except requests.exceptions.RequestException as e:
+                raise Exception(f"Erro na requisição HTTP: {str(e)}")
+            finally:
+                if body is not encoder:
+                    body.close()
+    
+    def _server_accepts_gzip(self) -> bool:
+        """Verifica uma única vez, via OPTIONS, se a API anuncia suporte a corpo gzip."""
+        if self._gzip_supported is None:
+            try:
+                response = self.session.options(f"{self.base_url}/importacao-excel/upload", timeout=10)
+                self._gzip_supported = "gzip" in response.headers.get("Accept-Encoding", "").lower()
+            except requests.exceptions.RequestException as e:
+                self.logger.warning("Não foi possível verificar o suporte a gzip da API: %s", e)
+                self._gzip_supported = False
+            
+            if not self._gzip_supported:
+                self.logger.info("A API não anuncia suporte a gzip; o upload seguirá sem compressão")
+        
+        return self._gzip_supported
+    
+    def _compress_body(self, encoder: MultipartEncoder) -> BinaryIO:
+        """
+        Comprime o corpo multipart com gzip, em blocos, para um arquivo temporário.
+        
+        O arquivo resultante pode ser rebobinado, o que mantém as novas tentativas
+        do adapter funcionando com o corpo comprimido.
+        """
+        compressed = tempfile.TemporaryFile()
+        with gzip.GzipFile(fileobj=compressed, mode='wb') as gzip_file:
+            while True:
+                chunk = encoder.read(64 * 1024)
+                if not chunk:
+                    break
+                gzip_file.write(chunk)
+        
+        compressed.seek(0)
+        return compressed
     
     def _handle_response(self, response: requests.Response, file_path: str) -> Dict[str, Any]:
         """
@@ -107,58 +338,22 @@ class CombustivelAPIClient:
         Note: A API de Combustível retorna status 201 (Created) para uploads bem-sucedidos,
         que é o padrão REST para operações de criação. Também suportamos 200 para compatibilidade.
         """
-        self.logger.info(f"Status da resposta: {response.status_code}")
+        self.logger.info("Status da resposta: %s", response.status_code)
         
         try:
             response_data = response.json()
         except ValueError:
             response_data = {"message": response.text}
         
-        if response.status_code == 201:
-            self.logger.info(f"Upload realizado com sucesso: {file_path}")
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "message": "Upload realizado com sucesso",
-                "data": response_data,
-                "file_path": file_path
-            }
-        
-        elif response.status_code == 200:
-            # Algumas APIs podem retornar 200 em vez de 201
-            self.logger.info(f"Upload realizado com sucesso: {file_path}")
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "message": "Upload realizado com sucesso",
-                "data": response_data,
-                "file_path": file_path
-            }
-        
-        elif response.status_code == 401:
-            error_msg = "Erro de autenticação. Verifique o token de autorização."
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        elif response.status_code == 413:
-            error_msg = "Arquivo muito grande para upload."
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        elif response.status_code == 422:
-            error_msg = f"Erro de validação: {response_data.get('message', 'Dados inválidos')}"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
-        
-        elif response.status_code >= 500:
-            error_msg = f"Erro interno do servidor: {response_data.get('message', 'Erro desconhecido')}"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
+        return self._evaluate_response(response.status_code, response_data, file_path)
+    
+    def _evaluate_response(self, status_code: int, response_data: Any, file_path: str) -> Dict[str, Any]:
+        """Interpreta o status e o corpo já decodificado da resposta de upload."""
+        handler = self._STATUS_HANDLERS.get(status_code)
+        if handler is None:
+            handler = _server_error if status_code >= 500 else _unexpected_error
         
-        else:
-            error_msg = f"Erro no upload (HTTP {response.status_code}): {response_data.get('message', 'Erro desconhecido')}"
-            self.logger.error(error_msg)
-            raise Exception(error_msg)
+        return handler(self, status_code, response_data, file_path)
     
     def test_connection(self) -> bool:
         """Testa a conexão com a API."""
@@ -166,12 +361,13 @@ class CombustivelAPIClient:
             with TaskProgress("Testando conexão com API", 100) as progress:
                 progress.update(50, "Verificando conectividade")
                 
-                # Tenta uma requisição simples para verificar conectividade
-                response = self.session.get(f"{self.base_url}/", timeout=10)
+                # HEAD pela sessão compartilhada: sem corpo de resposta e a conexão
+                # aberta fica no pool para o upload seguinte
+                response = self.session.head(f"{self.base_url}/", allow_redirects=False, timeout=5)
                 
                 progress.update(50, "Analisando resposta")
                 
-                self.logger.info(f"Teste de conexão - Status: {response.status_code}")
+                self.logger.info("Teste de conexão - Status: %s", response.status_code)
                 
                 # Considera sucesso para qualquer status que não seja erro de cliente/servidor
                 # ou para códigos específicos que indicam que a API está respondendo
@@ -182,7 +378,7 @@ class CombustivelAPIClient:
                     return False
                 
         except Exception as e:
-            self.logger.error(f"Falha no teste de conexão: {str(e)}")
+            self.logger.error("Falha no teste de conexão: %s", e)
             return False
     
     def get_upload_status(self, upload_id: Optional[str] = None) -> Dict[str, Any]:
@@ -211,7 +407,7 @@ class CombustivelAPIClient:
                 }
                 
         except Exception as e:
-            self.logger.error(f"Erro ao verificar status do upload: {str(e)}")
+            self.logger.error("Erro ao verificar status do upload: %s", e)
             return {"error": str(e)}
     
     def close(self):
@@ -231,22 +427,29 @@ class CombustivelAPIClient:
 class CombustivelAPIUploader:
     """Classe simplificada para upload de arquivos Excel."""
     
-    def __init__(self, api_url: str, auth_token: str):
+    def __init__(self, api_url: str, auth_token: str, max_concurrency: int = 8, gzip_upload: bool = False):
         """
         Inicializa o uploader.
         
         Args:
             api_url (str): URL da API de Combustível
             auth_token (str): Token de autenticação
+            max_concurrency (int): Número máximo de uploads simultâneos em lote
+            gzip_upload (bool): Comprime o corpo do upload com gzip, se a API anunciar suporte
         """
         if not api_url:
             raise ValueError("URL da API de Combustível é obrigatória")
         if not auth_token:
             raise ValueError("Token de autenticação é obrigatório")
+        if max_concurrency < 1:
+            raise ValueError("O número máximo de uploads simultâneos deve ser maior ou igual a 1")
             
         self.api_url = api_url
         self.token = auth_token
+        self.max_concurrency = max_concurrency
         self.logger = Logger("CombustivelUploader")
+        # Cliente único para reaproveitar as conexões abertas entre uploads
+        self._client = CombustivelAPIClient(base_url=self.api_url, auth_token=self.token, gzip_upload=gzip_upload)
     
     def upload_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -258,10 +461,97 @@ class CombustivelAPIUploader:
         Returns:
             Dict[str, Any]: Resultado do upload
         """
-        with CombustivelAPIClient(base_url=self.api_url, auth_token=self.token) as client:
-            return client.upload_excel_file(file_path)
+        return self._client.upload_excel_file(file_path)
+    
+    def upload_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Upload de vários arquivos em paralelo.
+        
+        Args:
+            file_paths (List[str]): Caminhos para os arquivos Excel
+            
+        Returns:
+            List[Dict[str, Any]]: Resultado de cada upload, na mesma ordem dos arquivos
+        """
+        return asyncio.run(self.upload_files_async(file_paths))
+    
+    async def upload_files_async(self, file_paths: List[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Envia vários arquivos simultaneamente usando uma única sessão aiohttp.
+        
+        Falhas individuais não interrompem os demais envios: o arquivo com erro
+        é reportado com "success" igual a False e a mensagem em "error".
+        """
+        import aiohttp
+        
+        limit = self.max_concurrency if max_concurrency is None else max_concurrency
+        if limit < 1:
+            raise ValueError("O número máximo de uploads simultâneos deve ser maior ou igual a 1")
+        semaphore = asyncio.Semaphore(limit)
+        connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=60)
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/json"
+        }
+        
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            async def _bounded(file_path: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        return await self._upload_one(session, file_path)
+                    except Exception as e:
+                        self.logger.error("Erro no upload do arquivo %s: %s", file_path, e)
+                        return {"success": False, "file_path": file_path, "error": str(e)}
+            
+            return await asyncio.gather(*[_bounded(path) for path in file_paths])
+    
+    async def _upload_one(self, session: "aiohttp.ClientSession", file_path: str, timeout: int = 300) -> Dict[str, Any]:
+        """Envia um único arquivo pela sessão aiohttp, lendo-o do disco sob demanda."""
+        import aiohttp
+        
+        self._client._validate_file(file_path)
+        url = f"{self._client.base_url}/importacao-excel/upload"
+        
+        with open(file_path, 'rb') as file:
+            form = aiohttp.FormData()
+            form.add_field(
+                'file',
+                file,
+                filename=os.path.basename(file_path),
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+            
+            try:
+                async with session.post(url, data=form, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    text = await response.text()
+                    status_code = response.status
+            except asyncio.TimeoutError:
+                raise Exception(f"Timeout na requisição após {timeout} segundos")
+            except aiohttp.ClientConnectionError:
+                raise Exception(f"Erro de conexão com a API: {self._client.base_url}")
+            except aiohttp.ClientError as e:
+                raise Exception(f"Erro na requisição HTTP: {str(e)}")
+        
+        self.logger.info("Status da resposta: %s", status_code)
+        try:
+            response_data = json.loads(text)
+        except ValueError:
+            response_data = {"message": text}
+        
+        return self._client._evaluate_response(status_code, response_data, file_path)
     
     def test_api_connection(self) -> bool:
         """Testa a conexão com a API."""
-        with CombustivelAPIClient(base_url=self.api_url, auth_token=self.token) as client:
-            return client.test_connection()
+        return self._client.test_connection()
+    
+    def close(self):
+        """Fecha o cliente HTTP compartilhado."""
+        self._client.close()
+    
+    def __enter__(self):
+        """Context manager - entrada."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager - saída."""
+        self.close()
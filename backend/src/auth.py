@@ -1,4 +1,3 @@
-import tableauserverclient as TSC
 from .config import Config
 from .progress import TaskProgress
 import time
@@ -14,6 +13,8 @@ class TableauAuthenticator:
         """Autentica no Tableau Cloud usando um Personal Access Token."""
         with TaskProgress("Autenticando no Tableau", 100) as progress:
             try:
+                import tableauserverclient as TSC
+                
                 progress.update(20, "Criando token de autenticação")
                 tableau_auth = TSC.PersonalAccessTokenAuth(
                     token_name=self.config.TABLEAU_TOKEN_NAME,
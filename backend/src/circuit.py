@@ -0,0 +1,98 @@
+import threading
+import time
+from typing import Dict
+
+class CircuitOpenError(Exception):
+    """Erro lançado quando o circuito está aberto e a chamada é bloqueada."""
+
+class _Circuit:
+    """Estado do circuito de uma única URL base."""
+    
+    def __init__(self):
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.next_try = 0.0
+        self.half_open_calls = 0
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples (fechado → aberto → meio-aberto) por URL base.
+    
+    Após `failure_threshold` falhas consecutivas o circuito abre e as chamadas
+    são bloqueadas durante `cooldown_s` segundos. Passado esse intervalo, até
+    `half_open_max` chamadas de teste são liberadas: um sucesso fecha o
+    circuito e uma falha volta a abri-lo.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, cooldown_s: float = 30, half_open_max: int = 2):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.half_open_max = half_open_max
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+    
+    def _get_circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+        return circuit
+    
+    def get_state(self, key: str) -> str:
+        """Retorna o estado atual do circuito."""
+        with self._lock:
+            return self._get_circuit(key).state
+    
+    def before_call(self, key: str) -> str:
+        """
+        Verifica se uma chamada pode ser feita.
+        
+        Returns:
+            str: Estado do circuito após a verificação
+        
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto
+        """
+        with self._lock:
+            circuit = self._get_circuit(key)
+            
+            if circuit.state == self.OPEN:
+                remaining = circuit.next_try - time.time()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Circuito aberto para {key}. Nova tentativa em {remaining:.1f} segundos"
+                    )
+                circuit.state = self.HALF_OPEN
+                circuit.half_open_calls = 0
+            
+            if circuit.state == self.HALF_OPEN:
+                if circuit.half_open_calls >= self.half_open_max:
+                    raise CircuitOpenError(f"Circuito meio-aberto para {key}. Aguardando chamadas de teste")
+                circuit.half_open_calls += 1
+            
+            return circuit.state
+    
+    def record_success(self, key: str) -> str:
+        """Registra uma chamada bem-sucedida e retorna o novo estado."""
+        with self._lock:
+            circuit = self._get_circuit(key)
+            circuit.state = self.CLOSED
+            circuit.failures = 0
+            circuit.half_open_calls = 0
+            return circuit.state
+    
+    def record_failure(self, key: str) -> str:
+        """Registra uma falha e retorna o novo estado."""
+        with self._lock:
+            circuit = self._get_circuit(key)
+            circuit.failures += 1
+            
+            if circuit.state == self.HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = self.OPEN
+                circuit.next_try = time.time() + self.cooldown_s
+                circuit.half_open_calls = 0
+            
+            return circuit.state
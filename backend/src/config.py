@@ -1,57 +1,99 @@
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 import os
 
+def _env_positive_int(name: str, default: int) -> int:
+    """Lê uma variável de ambiente inteira e positiva, usando o padrão quando vazia."""
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    
+    if value < 1:
+        raise Exception(f"Configuração inválida: {name} deve ser um inteiro maior ou igual a 1 (recebido: {raw!r})")
+    return value
+
+@dataclass(frozen=True)
 class Config:
     """Classe para gerenciar configurações da aplicação."""
     
-    def __init__(self):
+    # Declarado manualmente (em vez de slots=True) para manter compatibilidade com Python 3.9
+    __slots__ = (
+        'TABLEAU_SERVER', 'TABLEAU_SITE_ID', 'TABLEAU_TOKEN_NAME', 'TABLEAU_TOKEN_VALUE',
+        'OUTPUT_DIR', 'WORKBOOK_ID', 'VIEW_ID', 'NAME_FILE_ORIGINAL', 'NAME_FILE_PROCESSED',
+        'EXPORT_PARQUET', 'COMBUSTIVEL_API_URL', 'COMBUSTIVEL_API_TOKEN', 'ENABLE_API_UPLOAD',
+        'COMBUSTIVEL_MAX_CONCURRENCY', 'COMBUSTIVEL_GZIP_UPLOAD'
+    )
+    
+    # Configurações do Tableau Cloud
+    TABLEAU_SERVER: Optional[str]
+    TABLEAU_SITE_ID: Optional[str]
+    TABLEAU_TOKEN_NAME: Optional[str]
+    TABLEAU_TOKEN_VALUE: Optional[str]
+    OUTPUT_DIR: str
+    WORKBOOK_ID: Optional[str]
+    VIEW_ID: Optional[str]
+    NAME_FILE_ORIGINAL: str
+    NAME_FILE_PROCESSED: str
+    EXPORT_PARQUET: bool
+    
+    # Configurações da API de Combustível
+    COMBUSTIVEL_API_URL: Optional[str]
+    COMBUSTIVEL_API_TOKEN: Optional[str]
+    ENABLE_API_UPLOAD: bool
+    COMBUSTIVEL_MAX_CONCURRENCY: int
+    COMBUSTIVEL_GZIP_UPLOAD: bool
+    
+    _REQUIRED = (
+        'TABLEAU_SERVER', 'TABLEAU_SITE_ID', 'TABLEAU_TOKEN_NAME',
+        'TABLEAU_TOKEN_VALUE', 'WORKBOOK_ID', 'VIEW_ID'
+    )
+    _REQUIRED_API = ('COMBUSTIVEL_API_URL', 'COMBUSTIVEL_API_TOKEN')
+    
+    @classmethod
+    def load(cls) -> "Config":
+        """Carrega as configurações do ambiente uma única vez."""
         load_dotenv()
-        self._load_config()
-        
-    def _load_config(self):
-        """Carrega as configurações do ambiente."""
-        # Configurações do Tableau Cloud
-        self.TABLEAU_SERVER = os.getenv("TABLEAU_SERVER")
-        self.TABLEAU_SITE_ID = os.getenv("TABLEAU_SITE_ID")
-        self.TABLEAU_TOKEN_NAME = os.getenv("TABLEAU_TOKEN_NAME")
-        self.TABLEAU_TOKEN_VALUE = os.getenv("TABLEAU_TOKEN_VALUE")
-        self.OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")
-        self.WORKBOOK_ID = os.getenv("WORKBOOK_ID")
-        self.VIEW_ID = os.getenv("VIEW_ID")
-        self.NAME_FILE_ORIGINAL = os.getenv("NAME_FILE_ORIGINAL", "BASE_DE_DADOS.csv")
-        self.NAME_FILE_PROCESSED = os.getenv("NAME_FILE_PROCESSED", "ANALISE_DE_PEDIDOS.xlsx")
-        
-        # Configurações da API de Combustível
-        self.COMBUSTIVEL_API_URL = os.getenv("COMBUSTIVEL_API_URL")
-        self.COMBUSTIVEL_API_TOKEN = os.getenv("COMBUSTIVEL_API_TOKEN")
-        self.ENABLE_API_UPLOAD = os.getenv("ENABLE_API_UPLOAD", "true").lower() == "true"
+        return cls(
+            TABLEAU_SERVER=os.getenv("TABLEAU_SERVER"),
+            TABLEAU_SITE_ID=os.getenv("TABLEAU_SITE_ID"),
+            TABLEAU_TOKEN_NAME=os.getenv("TABLEAU_TOKEN_NAME"),
+            TABLEAU_TOKEN_VALUE=os.getenv("TABLEAU_TOKEN_VALUE"),
+            OUTPUT_DIR=os.getenv("OUTPUT_DIR", "output"),
+            WORKBOOK_ID=os.getenv("WORKBOOK_ID"),
+            VIEW_ID=os.getenv("VIEW_ID"),
+            NAME_FILE_ORIGINAL=os.getenv("NAME_FILE_ORIGINAL", "BASE_DE_DADOS.csv"),
+            NAME_FILE_PROCESSED=os.getenv("NAME_FILE_PROCESSED", "ANALISE_DE_PEDIDOS.xlsx"),
+            EXPORT_PARQUET=os.getenv("EXPORT_PARQUET", "false").lower() == "true",
+            COMBUSTIVEL_API_URL=os.getenv("COMBUSTIVEL_API_URL"),
+            COMBUSTIVEL_API_TOKEN=os.getenv("COMBUSTIVEL_API_TOKEN"),
+            ENABLE_API_UPLOAD=os.getenv("ENABLE_API_UPLOAD", "true").lower() == "true",
+            COMBUSTIVEL_MAX_CONCURRENCY=_env_positive_int("COMBUSTIVEL_MAX_CONCURRENCY", 8),
+            COMBUSTIVEL_GZIP_UPLOAD=os.getenv("COMBUSTIVEL_GZIP_UPLOAD", "false").lower() == "true"
+        )
     
     def ensure_output_directory(self):
         """Cria o diretório de saída caso ele não exista."""
-        if not os.path.exists(self.OUTPUT_DIR):
+        try:
             os.makedirs(self.OUTPUT_DIR)
             print(f"Diretório criado: {self.OUTPUT_DIR}")
-        else:
+        except FileExistsError:
             print(f"Diretório já existe: {self.OUTPUT_DIR}")
     
     def validate_config(self):
         """Valida se todas as configurações necessárias estão definidas."""
-        required_configs = [
-            'TABLEAU_SERVER', 'TABLEAU_SITE_ID', 'TABLEAU_TOKEN_NAME',
-            'TABLEAU_TOKEN_VALUE', 'WORKBOOK_ID', 'VIEW_ID'
-        ]
-        
-        missing_configs = []
-        for config in required_configs:
-            if not getattr(self, config):
-                missing_configs.append(config)
+        required_configs = self._REQUIRED
         
         # Verificar configurações da API se upload estiver habilitado
         if self.ENABLE_API_UPLOAD:
-            api_configs = ['COMBUSTIVEL_API_URL', 'COMBUSTIVEL_API_TOKEN']
-            for config in api_configs:
-                if not getattr(self, config):
-                    missing_configs.append(config)
+            required_configs += self._REQUIRED_API
+        
+        missing_configs = [name for name in required_configs if not getattr(self, name)]
         
         if missing_configs:
             raise Exception(f"Configurações obrigatórias não definidas: {', '.join(missing_configs)}")
@@ -1,11 +1,23 @@
-import pandas as pd
+import os
 from .progress import TaskProgress
-from tqdm import tqdm
+from .utils import Logger
+
+_pd = None
+
+def _get_pd():
+    """Importa o pandas sob demanda, evitando seu custo na inicialização."""
+    global _pd
+    if _pd is None:
+        import pandas as pd
+        _pd = pd
+    return _pd
 
 class DataProcessor:
     """Classe responsável pelo processamento e transformação de dados."""
     
-    def __init__(self):
+    def __init__(self, export_parquet=False):
+        self.export_parquet = export_parquet
+        self.logger = Logger("DataProcessor")
         self.expected_columns = [
             "Cidades", "Combustíveis", "Measure Names", "Origens", 
             "Medição", "Turno + Data", "Measure Values"
@@ -37,21 +49,33 @@ class DataProcessor:
             "Sugest. "   # Com espaço extra
         ]
     
+    def preload(self):
+        """Importa antecipadamente as bibliotecas usadas na transformação."""
+        _get_pd()
+        import pyarrow.csv
+        import xlsxwriter
+    
     def transform_csv_to_xlsx(self, csv_path, xlsx_path):
         """Lê o CSV, transforma os dados e salva em XLSX."""
         with TaskProgress("Processando dados CSV para XLSX", 100) as progress:
             try:
-                progress.update(10, "Carregando arquivo CSV")
-                # Ler o CSV com pandas
-                df = pd.read_csv(csv_path)
+                pd = _get_pd()
                 
                 progress.update(10, "Validando estrutura dos dados")
-                # Validar colunas
-                self._validate_columns(df)
+                # Validar colunas pelo cabeçalho, antes de ler o arquivo inteiro
+                self._validate_columns(self._read_csv_column_names(csv_path))
+                
+                progress.update(10, "Carregando arquivo CSV")
+                # Ler o CSV com o leitor multi-thread do PyArrow
+                df = pd.read_csv(
+                    csv_path,
+                    engine="pyarrow",
+                    dtype_backend="pyarrow",
+                    dtype={col: "string" for col in self.expected_columns}
+                )
                 
                 # Exibir valores únicos de Measure Names para depuração
-                measure_names_found = df["Measure Names"].unique().tolist()
-                print(f"Colunas encontradas em 'Measure Names': {measure_names_found}")
+                self.logger.info("Colunas encontradas em 'Measure Names': %s", df["Measure Names"].unique().tolist())
                 
                 progress.update(30, "Pivotando tabela de dados")
                 # Pivotar a tabela
@@ -72,18 +96,30 @@ class DataProcessor:
             except Exception as e:
                 raise Exception(f"Erro ao transformar o CSV em XLSX: {str(e)}")
     
-    def _validate_columns(self, df):
-        """Valida se o DataFrame contém todas as colunas esperadas."""
-        if not all(col in df.columns for col in self.expected_columns):
+    def _read_csv_column_names(self, csv_path):
+        """Lê apenas o esquema do CSV (cabeçalho e primeiro bloco) e retorna os nomes das colunas."""
+        import pyarrow.csv
+        
+        with pyarrow.csv.open_csv(csv_path) as reader:
+            return reader.schema.names
+    
+    def _validate_columns(self, columns):
+        """Valida se a lista de colunas contém todas as colunas esperadas."""
+        if not all(col in columns for col in self.expected_columns):
             raise Exception(f"O CSV não contém todas as colunas esperadas: {self.expected_columns}")
     
     def _pivot_dataframe(self, df):
         """Realiza o pivot do DataFrame."""
-        return df.pivot_table(
-            index=["Cidades", "Origens", "Turno + Data", "Combustíveis", "Medição"],
+        index_columns = ["Cidades", "Origens", "Turno + Data", "Combustíveis", "Medição"]
+        key_columns = index_columns + ["Measure Names"]
+        # Descarta linhas sem chave ou sem valor antes de deduplicar, para manter o
+        # primeiro valor não nulo de cada combinação (como o aggfunc="first" do pivot_table)
+        df = df.dropna(subset=key_columns + ["Measure Values"])
+        df = df.drop_duplicates(subset=key_columns, keep="first")
+        return df.pivot(
+            index=index_columns,
             columns="Measure Names",
-            values="Measure Values",
-            aggfunc="first"  # Assume um único valor por combinação
+            values="Measure Values"
         ).reset_index()
     
     def _reorder_columns(self, df_pivot):
@@ -91,7 +127,7 @@ class DataProcessor:
         # Verificar se todas as colunas de measure_names_order estão presentes
         missing_columns = [col for col in self.measure_names_order if col not in df_pivot.columns]
         if missing_columns:
-            print(f"Aviso: As seguintes colunas de Measure Names não estão no CSV: {missing_columns}")
+            self.logger.warning("As seguintes colunas de Measure Names não estão no CSV: %s", missing_columns)
             # Filtrar apenas colunas existentes
             available_measure_names = [col for col in self.measure_names_order if col in df_pivot.columns]
         else:
@@ -104,19 +140,50 @@ class DataProcessor:
     def _process_numeric_values(self, df):
         """Processa valores numéricos de forma segura."""
         non_index_columns = ["Cidades", "Origens", "Turno + Data", "Combustíveis", "Medição"]
+        numeric_block = df.drop(columns=non_index_columns)
+        
+        # Separa uma única vez as colunas de texto (que precisam remover vírgulas) das já numéricas
+        text_columns = numeric_block.select_dtypes(include=["object", "string"]).columns
+        other_columns = numeric_block.columns.difference(text_columns, sort=False)
         
-        # Usar tqdm para mostrar progresso do processamento de colunas
-        numeric_columns = [col for col in df.columns if col not in non_index_columns]
+        pd = _get_pd()
         
-        for col in tqdm(numeric_columns, desc="Processando colunas numéricas", leave=False):
-            if df[col].dtype.name == "object":  # Apenas para colunas de strings
-                df[col] = pd.to_numeric(df[col].str.replace(",", "", regex=False), errors="coerce")
-            else:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+        if len(text_columns):
+            # Converte todo o bloco de texto em uma única passada vetorizada
+            block = df[text_columns]
+            flat = pd.Series(block.to_numpy(dtype=object).ravel()).astype(str)
+            converted = pd.to_numeric(flat.str.replace(",", "", regex=False), errors="coerce")
+            df[text_columns] = pd.DataFrame(
+                converted.to_numpy().reshape(block.shape),
+                index=df.index,
+                columns=text_columns
+            )
+        
+        if len(other_columns):
+            df[other_columns] = df[other_columns].apply(pd.to_numeric, errors="coerce")
         
         return df
     
     def _save_to_xlsx(self, df, xlsx_path):
         """Salva o DataFrame em formato XLSX."""
-        df.to_excel(xlsx_path, index=False, engine="openpyxl")
-        print(f"Dados transformados salvos em: {xlsx_path}")
+        # O modo constant_memory descarrega cada linha em disco assim que ela é
+        # concluída, por isso a planilha é escrita linha a linha, em ordem.
+        import xlsxwriter
+        
+        workbook = xlsxwriter.Workbook(xlsx_path, {"constant_memory": True, "strings_to_numbers": False})
+        try:
+            worksheet = workbook.add_worksheet()
+            header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+            worksheet.write_row(0, 0, df.columns, header_format)
+            
+            values = df.astype(object).where(df.notna(), None)
+            for row_number, row in enumerate(values.itertuples(index=False, name=None), start=1):
+                worksheet.write_row(row_number, 0, row)
+        finally:
+            workbook.close()
+        self.logger.info("Dados transformados salvos em: %s", xlsx_path)
+        
+        if self.export_parquet:
+            parquet_path = os.path.splitext(xlsx_path)[0] + ".parquet"
+            df.to_parquet(parquet_path, index=False)
+            self.logger.info("Cópia em Parquet salva em: %s", parquet_path)
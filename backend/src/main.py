@@ -6,15 +6,15 @@ from .utils import Logger
 from .progress import TaskProgress
 from .api_integration import CombustivelAPIUploader
 import os
-from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 
 class TableauAPIApp:
     """Classe principal da aplicação Tableau API."""
     
     def __init__(self):
-        self.config = Config()
+        self.config = Config.load()
         self.authenticator = TableauAuthenticator(self.config)
-        self.data_processor = DataProcessor()
+        self.data_processor = DataProcessor(export_parquet=self.config.EXPORT_PARQUET)
         self.logger = Logger("TableauAPIApp")
         
         # Inicializar uploader apenas se upload estiver habilitado e configurações estiverem presentes
@@ -23,7 +23,9 @@ class TableauAPIApp:
             self.config.COMBUSTIVEL_API_TOKEN):
             self.api_uploader = CombustivelAPIUploader(
                 self.config.COMBUSTIVEL_API_URL,
-                self.config.COMBUSTIVEL_API_TOKEN
+                self.config.COMBUSTIVEL_API_TOKEN,
+                max_concurrency=self.config.COMBUSTIVEL_MAX_CONCURRENCY,
+                gzip_upload=self.config.COMBUSTIVEL_GZIP_UPLOAD
             )
         else:
             self.api_uploader = None
@@ -31,6 +33,19 @@ class TableauAPIApp:
         self.server = None
         self.exporter = None
     
+    def shutdown(self):
+        """Libera os recursos mantidos durante a execução, como o cliente HTTP da API."""
+        if self.api_uploader:
+            self.api_uploader.close()
+    
+    def __enter__(self):
+        """Context manager - entrada."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager - saída."""
+        self.shutdown()
+    
     def initialize(self):
         """Inicializa a aplicação com configurações e autenticação."""
         with TaskProgress("Inicializando aplicação", 100) as progress:
@@ -59,14 +74,13 @@ class TableauAPIApp:
                 self.logger.info("Aplicação inicializada com sucesso!")
                 
             except Exception as e:
-                self.logger.error(f"Erro na inicialização: {str(e)}")
+                self.logger.error("Erro na inicialização: %s", e)
                 raise Exception(f"Erro na inicialização: {str(e)}")
     
     def run(self):
         """Executa o fluxo principal da aplicação."""
         try:
-            print("\n🚀 Iniciando processamento dos dados do Tableau...")
-            print("=" * 60)
+            print("\n🚀 Iniciando processamento dos dados do Tableau...\n" + "=" * 60)
             
             # Inicializar aplicação
             self.initialize()
@@ -75,10 +89,7 @@ class TableauAPIApp:
             csv_path = os.path.join(self.config.OUTPUT_DIR, self.config.NAME_FILE_ORIGINAL)
             xlsx_path = os.path.join(self.config.OUTPUT_DIR, self.config.NAME_FILE_PROCESSED)
             
-            print(f"\n📁 Arquivos de saída:")
-            print(f"   CSV: {csv_path}")
-            print(f"   XLSX: {xlsx_path}")
-            print()
+            print(f"\n📁 Arquivos de saída:\n   CSV: {csv_path}\n   XLSX: {xlsx_path}\n")
             
             # Fluxo principal com barra de progresso geral
             main_steps = [
@@ -91,41 +102,51 @@ class TableauAPIApp:
             if self.config.ENABLE_API_UPLOAD and self.api_uploader:
                 main_steps.append(("Enviando para API de Combustível", lambda: self._upload_to_api(xlsx_path)))
             
-            for step_name, step_function in tqdm(main_steps, desc="Progresso geral", unit="etapa"):
-                self.logger.info(f"Executando: {step_name}")
-                step_function()
+            # A transformação precisa do CSV completo, então ela não pode consumir a
+            # exportação em andamento; o que se sobrepõe ao download é o carregamento
+            # das bibliotecas de processamento, feito em segundo plano.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(self.data_processor.preload)
+                
+                for i, (step_name, step_function) in enumerate(main_steps, start=1):
+                    print(f"[{i}/{len(main_steps)}] {step_name}")
+                    self.logger.info("Executando: %s", step_name)
+                    step_function()
             
-            print("\n✅ Processamento concluído com sucesso!")
-            print("=" * 60)
+            print("\n✅ Processamento concluído com sucesso!\n" + "=" * 60)
             self.logger.info("Processamento concluído com sucesso!")
             
             # Mostrar informações dos arquivos gerados
             self._show_file_info(csv_path, xlsx_path)
             
         except Exception as e:
-            print(f"\n❌ Erro durante a execução: {str(e)}")
-            print("=" * 60)
-            self.logger.error(f"Erro durante a execução: {str(e)}")
+            print(f"\n❌ Erro durante a execução: {str(e)}\n" + "=" * 60)
+            self.logger.error("Erro durante a execução: %s", e)
             raise
     
     def _show_file_info(self, csv_path, xlsx_path):
         """Mostra informações sobre os arquivos gerados."""
-        print("\n📊 Informações dos arquivos gerados:")
+        lines = ["\n📊 Informações dos arquivos gerados:"]
         
-        if os.path.exists(csv_path):
-            csv_size = os.path.getsize(csv_path)
-            print(f"   📄 CSV: {csv_size:,} bytes")
+        # Uma única leitura do diretório de saída cobre todos os arquivos gerados
+        try:
+            with os.scandir(self.config.OUTPUT_DIR) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            entries = {}
         
-        if os.path.exists(xlsx_path):
-            xlsx_size = os.path.getsize(xlsx_path)
-            print(f"   📈 XLSX: {xlsx_size:,} bytes")
+        for label, path in [("📄 CSV", csv_path), ("📈 XLSX", xlsx_path)]:
+            entry = entries.get(os.path.basename(path))
+            if entry:
+                lines.append(f"   {label}: {entry.stat().st_size:,} bytes")
         
-        print()
+        # Emite o bloco em uma única escrita no stdout
+        print("\n".join(lines) + "\n")
     
     def _upload_to_api(self, xlsx_path):
         """Faz upload do arquivo XLSX para a API de combustível."""
         try:
-            self.logger.info(f"Iniciando upload para API: {xlsx_path}")
+            self.logger.info("Iniciando upload para API: %s", xlsx_path)
             
             # Verificar se o arquivo existe
             if not os.path.exists(xlsx_path):
@@ -148,7 +169,7 @@ class TableauAPIApp:
                 print(f"❌ Falha no upload para API")
                 
         except Exception as e:
-            self.logger.error(f"Erro no upload para API: {str(e)}")
+            self.logger.error("Erro no upload para API: %s", e)
             print(f"⚠️  Erro no upload para API: {str(e)}")
             # Não falha o processo principal se o upload falhar
             print("   ℹ️  O processamento principal foi concluído com sucesso")
@@ -156,8 +177,8 @@ class TableauAPIApp:
 def main():
     """Função principal de entrada da aplicação."""
     try:
-        app = TableauAPIApp()
-        app.run()
+        with TableauAPIApp() as app:
+            app.run()
     except KeyboardInterrupt:
         print("\n\n⚠️  Processamento interrompido pelo usuário.")
     except Exception as e:
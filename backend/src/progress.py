@@ -15,16 +15,17 @@ class ProgressManager:
             desc=description,
             unit=unit,
             bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
-            colour='green'
+            colour='green',
+            mininterval=0.1  # miniters omitido: com None o tqdm ativa o ajuste dinâmico (dynamic_miniters)
         )
         return self.current_bar
     
     def update_progress(self, n: int = 1, description: Optional[str] = None):
         """Atualiza a barra de progresso atual."""
         if self.current_bar:
-            self.current_bar.update(n)
             if description:
-                self.current_bar.set_description(description)
+                self.current_bar.set_description(description, refresh=False)
+            self.current_bar.update(n)
     
     def finish_progress(self, final_message: Optional[str] = None):
         """Finaliza a barra de progresso atual."""
@@ -42,20 +43,25 @@ class ProgressManager:
 class TaskProgress:
     """Context manager para barras de progresso de tarefas."""
     
-    def __init__(self, description: str, total_steps: int = 100, unit: str = "%"):
+    # Intervalo mínimo entre atualizações absolutas (update_to), em segundos
+    UPDATE_INTERVAL = 0.1
+    
+    def __init__(self, description: str, total_steps: int = 100, unit: str = "%", linger: float = 0.0):
         self.description = description
         self.total_steps = total_steps
         self.unit = unit
+        self.linger = linger  # Pausa opcional, em segundos, para visualizar o resultado
         self.progress_bar = None
         self.current_step = 0
+        self._last_update_time = 0.0
     
     def __enter__(self):
         self.progress_bar = tqdm(
             total=self.total_steps,
             desc=self.description,
             unit=self.unit,
-            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]',
-            colour='blue'
+            bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}',
+            mininterval=0.1  # miniters omitido: com None o tqdm ativa o ajuste dinâmico (dynamic_miniters)
         )
         return self
     
@@ -72,33 +78,46 @@ class TaskProgress:
                 self.progress_bar.colour = 'red'
                 self.progress_bar.refresh()
             
-            time.sleep(0.5)  # Pequena pausa para visualizar o resultado
+            if self.linger > 0:
+                time.sleep(self.linger)
             self.progress_bar.close()
     
     def update(self, steps: int = 1, message: Optional[str] = None):
         """Atualiza o progresso."""
         if self.progress_bar:
-            self.current_step = min(self.current_step + steps, self.total_steps)
-            self.progress_bar.n = self.current_step
-            if message:
-                self.progress_bar.set_description(f"{self.description} - {message}")
-            self.progress_bar.refresh()
+            self._move_to(min(self.current_step + steps, self.total_steps), message)
     
     def set_progress(self, percentage: float, message: Optional[str] = None):
         """Define o progresso como uma porcentagem."""
         if self.progress_bar:
-            self.current_step = int((percentage / 100) * self.total_steps)
-            self.progress_bar.n = self.current_step
-            if message:
-                self.progress_bar.set_description(f"{self.description} - {message}")
-            self.progress_bar.refresh()
+            self._move_to(int((percentage / 100) * self.total_steps), message)
+    
+    def _move_to(self, step: int, message: Optional[str] = None):
+        """Avança a barra até o passo informado, deixando o tqdm decidir quando redesenhar."""
+        if message:
+            self.progress_bar.set_description(f"{self.description} - {message}", refresh=False)
+        self.progress_bar.update(step - self.current_step)
+        self.current_step = step
+    
+    def update_to(self, current: int, total: int, message: Optional[str] = None):
+        """
+        Define o progresso de forma absoluta a partir de uma contagem (ex.: bytes enviados).
+        
+        As atualizações são limitadas a cerca de 10 por segundo para que o desenho
+        da barra não concorra com o trabalho real; a conclusão é sempre exibida.
+        """
+        if self.progress_bar and total > 0:
+            now = time.monotonic()
+            if current < total and now - self._last_update_time < self.UPDATE_INTERVAL:
+                return
+            self._last_update_time = now
+            self.set_progress(min(current, total) * 100 / total, message)
 
 def simulate_work_with_progress(description: str, steps: int, work_function=None):
     """Simula trabalho com barra de progresso."""
-    with TaskProgress(description, steps) as progress:
-        for i in range(steps):
-            if work_function:
-                work_function(i)
-            else:
-                time.sleep(0.1)  # Simula trabalho
-            progress.update(1, f"Processando item {i+1}/{steps}")
+    # miniters omitido para que o tqdm ajuste a frequência dinamicamente (dynamic_miniters)
+    for i in tqdm(range(steps), desc=description, mininterval=0.1):
+        if work_function:
+            work_function(i)
+        else:
+            time.sleep(0.1)  # Simula trabalho
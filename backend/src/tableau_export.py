@@ -1,5 +1,5 @@
-import tableauserverclient as TSC
-import os
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .progress import TaskProgress
 
 class TableauExporter:
@@ -7,6 +7,24 @@ class TableauExporter:
     
     def __init__(self, server):
         self.server = server
+        self._workbook_cache = {}  # workbook_id -> workbook
+        self._all_workbooks = None  # workbook_id -> workbook, carregado pela listagem completa
+        self._views_populated = set()  # workbook_ids com views já carregadas
+        self._view_index = {}  # workbook_id -> {view_id: view}
+        self._configure_connection_pool()
+    
+    def _configure_connection_pool(self):
+        """Amplia o pool de conexões da sessão do TSC para reaproveitar conexões HTTPS entre chamadas."""
+        session = getattr(self.server, "_session", None)
+        if session is None:
+            return
+        
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
     
     def export_base_dados_csv(self, workbook_id, view_id, csv_path):
         """Exporta a worksheet BASE DE DADOS do Tableau Server para um arquivo CSV."""
@@ -18,7 +36,7 @@ class TableauExporter:
                 
                 progress.update(20, "Carregando visualizações")
                 # Popula as visualizações da pasta de trabalho
-                self.server.workbooks.populate_views(workbook)
+                self._populate_views(workbook)
                 
                 progress.update(20, "Localizando view específica")
                 # Encontrar a view pelo ID
@@ -34,27 +52,57 @@ class TableauExporter:
                 raise Exception(f"Erro ao exportar a worksheet BASE DE DADOS: {str(e)}")
     
     def _get_workbook(self, workbook_id):
-        """Obtém a pasta de trabalho pelo ID."""
-        workbook = self.server.workbooks.get_by_id(workbook_id)
-        if not workbook:
-            raise Exception(f"Pasta de trabalho com ID {workbook_id} não encontrada.")
+        """Obtém a pasta de trabalho pelo ID, reaproveitando consultas e a listagem já carregadas."""
+        workbook = self._workbook_cache.get(workbook_id)
+        if workbook is None and self._all_workbooks is not None:
+            workbook = self._all_workbooks.get(workbook_id)
+        if workbook is None:
+            # Uma consulta direta evita paginar todas as pastas do site para achar apenas uma
+            workbook = self.server.workbooks.get_by_id(workbook_id)
+            if not workbook:
+                raise Exception(f"Pasta de trabalho com ID {workbook_id} não encontrada.")
+        self._workbook_cache[workbook_id] = workbook
         return workbook
     
+    def _prime_workbooks(self):
+        """Carrega todas as pastas de trabalho de uma vez, paginando, na primeira listagem."""
+        if self._all_workbooks is None:
+            import tableauserverclient as TSC
+            
+            pager = TSC.Pager(self.server.workbooks)
+            self._all_workbooks = {wb.id: wb for wb in pager}
+        return self._all_workbooks
+    
+    def _populate_views(self, workbook):
+        """Carrega as views da pasta de trabalho apenas na primeira vez."""
+        if workbook.id not in self._views_populated:
+            self.server.workbooks.populate_views(workbook)
+            self._views_populated.add(workbook.id)
+    
     def _get_view(self, workbook, view_id):
         """Encontra a view pelo ID dentro da pasta de trabalho."""
-        for view in workbook.views:
-            if view.id == view_id:
-                return view
+        views_by_id = self._view_index.get(workbook.id)
+        if views_by_id is None:
+            views_by_id = self._view_index[workbook.id] = {view.id: view for view in workbook.views}
         
-        raise Exception(f"View com ID {view_id} não encontrada.")
+        view = views_by_id.get(view_id)
+        if view is None:
+            raise Exception(f"View com ID {view_id} não encontrada.")
+        return view
     
     def _export_view_to_csv(self, view, csv_path):
-        """Exporta a view para um arquivo CSV."""
+        """
+        Exporta a view para um arquivo CSV.
+        
+        O diretório de destino deve existir; TableauAPIApp.initialize já o cria
+        via Config.ensure_output_directory.
+        """
         self.server.views.populate_csv(view)
-        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
         
-        with open(csv_path, "wb") as f:
-            f.write(b''.join(view.csv))
+        # Grava os blocos à medida que chegam, sem juntar o CSV inteiro em memória
+        with open(csv_path, "wb", buffering=1024 * 1024) as f:
+            for chunk in view.csv:
+                f.write(chunk)
         
         print(f"Dados da worksheet 'BASE DE DADOS' exportados para: {csv_path}")
     
@@ -62,7 +110,7 @@ class TableauExporter:
         """Lista todas as pastas de trabalho disponíveis."""
         with TaskProgress("Listando pastas de trabalho", 100) as progress:
             progress.update(50, "Obtendo lista do servidor")
-            workbooks, _ = self.server.workbooks.get()
+            workbooks = self._prime_workbooks().values()
             progress.update(50, "Processando resultados")
             return [(wb.id, wb.name) for wb in workbooks]
     
@@ -72,6 +120,6 @@ class TableauExporter:
             progress.update(30, "Obtendo pasta de trabalho")
             workbook = self._get_workbook(workbook_id)
             progress.update(40, "Carregando views")
-            self.server.workbooks.populate_views(workbook)
+            self._populate_views(workbook)
             progress.update(30, "Processando resultados")
             return [(view.id, view.name) for view in workbook.views]
\ No newline at end of file
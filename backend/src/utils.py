@@ -1,6 +1,43 @@
 import os
 import logging
-from datetime import datetime
+import threading
+from logging.handlers import TimedRotatingFileHandler
+
+_shared_handlers = None
+_shared_handlers_lock = threading.Lock()
+
+def _get_shared_handlers():
+    """
+    Cria, uma única vez, os handlers de console e arquivo compartilhados por todos os loggers.
+    
+    Assim cada Logger reaproveita o mesmo descritor do arquivo de log em vez de abrir o seu.
+    """
+    global _shared_handlers
+    with _shared_handlers_lock:
+        if _shared_handlers is None:
+            # Handler para console
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            
+            # Handler para arquivo
+            log_dir = "logs"
+            os.makedirs(log_dir, exist_ok=True)
+            
+            # Rotaciona à meia-noite; delay=True só abre o arquivo na primeira escrita
+            log_file = os.path.join(log_dir, "tableau_api.log")
+            file_handler = TimedRotatingFileHandler(log_file, when="midnight", encoding='utf-8', delay=True)
+            file_handler.setLevel(logging.DEBUG)
+            
+            # Formato dos logs
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            console_handler.setFormatter(formatter)
+            file_handler.setFormatter(formatter)
+            
+            _shared_handlers = (console_handler, file_handler)
+        
+        return _shared_handlers
 
 class Logger:
     """Classe para gerenciar logs da aplicação."""
@@ -9,61 +46,45 @@ class Logger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
         
-        if not self.logger.handlers:
-            self._setup_handlers()
+        for handler in _get_shared_handlers():
+            if handler not in self.logger.handlers:
+                self.logger.addHandler(handler)
     
-    def _setup_handlers(self):
-        """Configura os handlers de log."""
-        # Handler para console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # Handler para arquivo
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        
-        log_file = os.path.join(log_dir, f"tableau_api_{datetime.now().strftime('%Y%m%d')}.log")
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Formato dos logs
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
-        
-        # Adicionar handlers
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-    
-    def info(self, message):
-        """Log de informação."""
-        self.logger.info(message)
+    def info(self, message, *args):
+        """Log de informação. Os argumentos só são formatados se o nível estiver habilitado."""
+        self.logger.info(message, *args)
     
-    def error(self, message):
-        """Log de erro."""
-        self.logger.error(message)
+    def error(self, message, *args):
+        """Log de erro. Os argumentos só são formatados se o nível estiver habilitado."""
+        self.logger.error(message, *args)
     
-    def warning(self, message):
-        """Log de aviso."""
-        self.logger.warning(message)
+    def warning(self, message, *args):
+        """Log de aviso. Os argumentos só são formatados se o nível estiver habilitado."""
+        self.logger.warning(message, *args)
     
-    def debug(self, message):
-        """Log de debug."""
-        self.logger.debug(message)
+    def debug(self, message, *args):
+        """Log de debug. Os argumentos só são formatados se o nível estiver habilitado."""
+        self.logger.debug(message, *args)
 
 class FileManager:
     """Classe para gerenciar operações com arquivos."""
     
     @staticmethod
     def ensure_directory(directory_path):
-        """Garante que um diretório existe."""
-        if not os.path.exists(directory_path):
+        """Garante que um diretório existe. Retorna True se ele precisou ser criado."""
+        try:
             os.makedirs(directory_path)
             return True
-        return False
+        except FileExistsError:
+            return False
+    
+    @staticmethod
+    def stat(file_path):
+        """Retorna o os.stat_result do arquivo, ou None se ele não existir."""
+        try:
+            return os.stat(file_path)
+        except FileNotFoundError:
+            return None
     
     @staticmethod
     def file_exists(file_path):
@@ -73,17 +94,17 @@ class FileManager:
     @staticmethod
     def get_file_size(file_path):
         """Retorna o tamanho do arquivo em bytes."""
-        if FileManager.file_exists(file_path):
-            return os.path.getsize(file_path)
-        return 0
+        file_stat = FileManager.stat(file_path)
+        return file_stat.st_size if file_stat else 0
     
     @staticmethod
     def delete_file(file_path):
         """Remove um arquivo se ele existir."""
-        if FileManager.file_exists(file_path):
+        try:
             os.remove(file_path)
             return True
-        return False
+        except FileNotFoundError:
+            return False
     
     @staticmethod
     def get_file_extension(file_path):
@@ -96,10 +117,7 @@ class ValidationHelper:
     @staticmethod
     def validate_required_fields(data, required_fields):
         """Valida se todos os campos obrigatórios estão presentes."""
-        missing_fields = []
-        for field in required_fields:
-            if not data.get(field):
-                missing_fields.append(field)
+        missing_fields = [field for field in required_fields if not data.get(field)]
         
         if missing_fields:
             raise ValueError(f"Campos obrigatórios ausentes: {', '.join(missing_fields)}")